@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency benchmark for the MCP + LLM pipeline
+Runs fully offline: the MCP server is started locally and Groq is replaced by
+groq_stub_server.py (stub responses or a replayed recording)
+
+Usage:
+  python3 benchmark_pipeline.py
+  python3 benchmark_pipeline.py --runs 5 --turns 4 --latency-ms 300 --tokens-per-second 250
+  python3 benchmark_pipeline.py --replay recordings/groq.jsonl --replay-latency
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from groq_stub_server import StubConfig, server_url, start_server
+from llm_client import GroqMCPClient
+
+DEFAULT_QUESTIONS = [
+    "How many assignments are in the database?",
+    "Which statuses are shown in the UI?",
+    "Are there any discrepancies between the database and the UI?",
+    "Which engineers are affected by that?",
+]
+
+
+def summarize(samples: List[float]) -> str:
+    if not samples:
+        return "no samples"
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return (f"min {ordered[0]:8.1f} ms | median {statistics.median(ordered):8.1f} ms | "
+            f"p95 {p95:8.1f} ms | max {ordered[-1]:8.1f} ms | n={len(ordered)}")
+
+
+async def wait_for_summary(client: GroqMCPClient, timings: Dict[str, List[float]]):
+    """Wait for a pending background summary, recording how long it blocked"""
+    if client._summary_task is None:
+        return
+    started = time.perf_counter()
+    await client.wait_for_summary()
+    timings["summary_wait"].append((time.perf_counter() - started) * 1000)
+
+
+async def run_benchmark(runs: int, questions: List[str], verbose: bool) -> Tuple[Dict[str, List[float]], List[float]]:
+    """Time each stage; failed turns are returned separately so they don't skew the stats"""
+    timings: Dict[str, List[float]] = {"connect_to_mcp": [], "query_groq": [], "summary_wait": [], "pipeline": []}
+    failed: List[float] = []
+
+    for run in range(1, runs + 1):
+        client = GroqMCPClient("offline-benchmark-key")
+        output = io.StringIO()
+        redirect = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(output)
+
+        with redirect:
+            run_started = time.perf_counter()
+            started = time.perf_counter()
+            await client.connect_to_mcp()
+            timings["connect_to_mcp"].append((time.perf_counter() - started) * 1000)
+
+            for question in questions:
+                # Background summaries from earlier turns are timed as their own stage
+                await wait_for_summary(client, timings)
+                started = time.perf_counter()
+                answer = await client.query_groq(question)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if answer.startswith("❌"):
+                    failed.append(elapsed_ms)
+                else:
+                    timings["query_groq"].append(elapsed_ms)
+            await wait_for_summary(client, timings)
+            timings["pipeline"].append((time.perf_counter() - run_started) * 1000)
+
+        print(f"   Run {run}/{runs}: {timings['pipeline'][-1]:.1f} ms")
+
+    return timings, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline latency benchmark for the MCP + LLM pipeline")
+    parser.add_argument("--runs", type=int, default=3, help="Full pipeline runs (default: 3)")
+    parser.add_argument("--turns", type=int, default=len(DEFAULT_QUESTIONS),
+                        help=f"Questions per run (default: {len(DEFAULT_QUESTIONS)})")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Stub time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Stub completion token rate")
+    parser.add_argument("--completion-tokens", type=int, default=40, help="Tokens per stub answer")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of injected errors")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for error injection (default: 0)")
+    parser.add_argument("--replay", metavar="FILE", help="Replay a recording instead of stub answers")
+    parser.add_argument("--replay-latency", action="store_true",
+                        help="With --replay, reproduce the recorded response latency")
+    parser.add_argument("--allow-errors", action="store_true",
+                        help="Exit 0 even if some queries fail (e.g. with --error-rate)")
+    parser.add_argument("--skip-check", action="store_true", help="Skip the MCP connection check")
+    parser.add_argument("--verbose", action="store_true", help="Show client output")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        replay_path=args.replay,
+        replay_latency=args.replay_latency,
+    )
+    server = start_server(config)
+    os.environ["GROQ_API_URL"] = server_url(server)
+
+    print("⏱️  MCP + LLM Pipeline Benchmark (offline)")
+    print("-" * 50)
+    print(f"Groq stand-in: {server_url(server)}"
+          + (f" (replaying {args.replay})" if args.replay else ""))
+
+    try:
+        if not args.skip_check:
+            from test_mcp_connection import test_mcp_connection
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                ok = asyncio.run(test_mcp_connection())
+            if not ok:
+                print("❌ MCP connection check failed. Run: python3 test_mcp_connection.py")
+                return 1
+            print("✅ MCP connection check passed")
+
+        questions = [DEFAULT_QUESTIONS[i % len(DEFAULT_QUESTIONS)] for i in range(args.turns)]
+        print(f"\n🚀 {args.runs} run(s) x {len(questions)} question(s)...")
+        timings, failed = asyncio.run(run_benchmark(args.runs, questions, args.verbose))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("\n" + "=" * 50)
+    print("📊 Results")
+    print("=" * 50)
+    for stage, samples in timings.items():
+        print(f"{stage:<15} {summarize(samples)}")
+    if failed:
+        print(f"{'failed turns':<15} {summarize(failed)}")
+    print(f"Stand-in served {config.request_count} request(s)")
+
+    if failed:
+        print(f"\n❌ {len(failed)} query(ies) returned an error")
+        if not args.allow_errors:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
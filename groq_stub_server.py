@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Groq (OpenAI-compatible) chat completions API
+Lets llm_client.py run without a GROQ_API_KEY or network (llm_client_playwright.py
+still needs network for npx @playwright/mcp)
+
+Modes:
+  stub    - generate deterministic answers with configurable latency, token rate,
+            streaming and injected 429/5xx errors (default)
+  record  - proxy requests to the real Groq API and save each request/response pair
+  replay  - answer from a recording, matching requests by their JSON body;
+            a request recorded several times gets its responses in recorded order;
+            streamed responses are replayed chunk by chunk, and --replay-latency
+            reproduces the recorded timing (otherwise replay is instant)
+
+Usage:
+  python3 groq_stub_server.py --port 8765 --latency-ms 200 --tokens-per-second 250
+  python3 groq_stub_server.py --record recordings/groq.jsonl
+  python3 groq_stub_server.py --replay recordings/groq.jsonl --replay-latency
+
+Then point a client at it:
+  GROQ_API_URL=http://127.0.0.1:8765/openai/v1/chat/completions python3 llm_client.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+CHAT_PATH = "/openai/v1/chat/completions"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token), matching llm_client.py"""
+    return (len(text) + 3) // 4
+
+
+def request_key(body: dict) -> str:
+    """Stable key for a request body, used to match recordings on replay"""
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class StubConfig:
+    def __init__(self, latency_ms: float = 0.0, tokens_per_second: float = 0.0,
+                 completion_tokens: int = 40, error_rate: float = 0.0,
+                 error_codes=(429, 500, 503), seed: Optional[int] = None,
+                 record_path: Optional[str] = None, replay_path: Optional[str] = None,
+                 replay_latency: bool = False, upstream_url: str = GROQ_URL,
+                 api_key: Optional[str] = None):
+        self.latency_ms = latency_ms
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.error_codes = list(error_codes)
+        self.record_path = record_path
+        self.replay_path = replay_path
+        self.replay_latency = replay_latency
+        self.upstream_url = upstream_url
+        self.api_key = api_key
+
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        # System prompts seen so far, to mimic provider-side prompt caching
+        self.seen_prefixes = set()
+        self.recordings: Dict[str, List[dict]] = {}
+        # How many times each recorded request has been replayed so far
+        self.replay_positions: Dict[str, int] = {}
+        if replay_path:
+            self.recordings = load_recordings(replay_path)
+
+
+def load_recordings(path: str) -> Dict[str, List[dict]]:
+    """Load a JSONL recording into {request_key: [entries in recorded order]}"""
+    recordings: Dict[str, List[dict]] = {}
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entry = json.loads(line)
+                recordings.setdefault(entry["key"], []).append(entry)
+    return recordings
+
+
+def build_completion(config: StubConfig, body: dict) -> dict:
+    """Build a deterministic chat completion for the given request"""
+    messages = body.get("messages", [])
+    question = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+    max_tokens = body.get("max_tokens") or config.completion_tokens
+    n_tokens = max(1, min(config.completion_tokens, max_tokens))
+
+    words = f"Stub answer to: {question}".split()
+    while len(words) < n_tokens:
+        words.append("lorem")
+    content = " ".join(words[:n_tokens])
+
+    prompt_tokens = sum(estimate_tokens(m.get("content", "")) for m in messages)
+    cached_tokens = 0
+    if messages and messages[0].get("role") == "system":
+        prefix = messages[0].get("content", "")
+        with config.lock:
+            if prefix in config.seen_prefixes:
+                cached_tokens = estimate_tokens(prefix)
+            config.seen_prefixes.add(prefix)
+
+    return {
+        "id": f"chatcmpl-stub-{config.request_count}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": n_tokens,
+            "total_tokens": prompt_tokens + n_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        },
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "GroqStub/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def config(self) -> StubConfig:
+        return self.server.config
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, payload: bytes, content_type: str = "application/json",
+              headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error_json(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        payload = json.dumps({"error": {"message": message, "type": "stub_error", "code": status}})
+        self._send(status, payload.encode("utf-8"), headers=headers)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            payload = {"object": "list", "data": [{"id": "llama-3.3-70b-versatile", "object": "model"}]}
+            self._send(200, json.dumps(payload).encode("utf-8"))
+        else:
+            self._send_error_json(404, f"Unknown path: {self.path}")
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away mid-response, e.g. a cancelled request
+
+    def do_POST(self):
+        # Always consume the body so it isn't parsed as the next request on a kept-alive connection
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length)
+
+        if self.path.rstrip("/") != CHAT_PATH:
+            self._send_error_json(404, f"Unknown path: {self.path}")
+            return
+
+        try:
+            body = json.loads(raw or b"{}")
+        except json.JSONDecodeError as e:
+            self._send_error_json(400, f"Invalid JSON: {e}")
+            return
+
+        with self.config.lock:
+            self.config.request_count += 1
+
+        if self.config.record_path:
+            self._proxy_and_record(raw, body)
+        elif self.config.replay_path:
+            self._replay(body)
+        else:
+            self._stub(body)
+
+    def _stub(self, body: dict):
+        config = self.config
+
+        if config.error_rate and config.error_codes:
+            with config.lock:
+                inject = config.rng.random() < config.error_rate
+                code = config.rng.choice(config.error_codes)
+            if inject:
+                headers = {"Retry-After": "1"} if code == 429 else None
+                self._send_error_json(code, f"Injected {code} error", headers=headers)
+                return
+
+        if config.latency_ms:
+            time.sleep(config.latency_ms / 1000)
+
+        completion = build_completion(config, body)
+        if body.get("stream"):
+            self._stream(completion)
+            return
+
+        if config.tokens_per_second:
+            time.sleep(completion["usage"]["completion_tokens"] / config.tokens_per_second)
+        self._send(200, json.dumps(completion).encode("utf-8"))
+
+    def _start_event_stream(self, status: int = 200, content_type: str = "text/event-stream"):
+        """Send headers for a response whose length is not known up front"""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def _stream(self, completion: dict):
+        """Send the completion as server-sent events, one token per chunk"""
+        self._start_event_stream()
+
+        delay = 1 / self.config.tokens_per_second if self.config.tokens_per_second else 0
+        words = completion["choices"][0]["message"]["content"].split(" ")
+        for i, word in enumerate(words):
+            chunk = {
+                "id": completion["id"],
+                "object": "chat.completion.chunk",
+                "created": completion["created"],
+                "model": completion["model"],
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": word if i == 0 else " " + word},
+                    "finish_reason": None,
+                }],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            if delay:
+                time.sleep(delay)
+
+        final = {
+            "id": completion["id"],
+            "object": "chat.completion.chunk",
+            "created": completion["created"],
+            "model": completion["model"],
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "x_groq": {"usage": completion["usage"]},
+        }
+        self.wfile.write(f"data: {json.dumps(final)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _replay(self, body: dict):
+        key = request_key(body)
+        entries = self.config.recordings.get(key)
+        if not entries:
+            self._send_error_json(404, "No recorded response for this request")
+            return
+        # Serve repeats in recorded order (e.g. a 429 then the retry's 200); once they
+        # run out, keep answering with the last one
+        with self.config.lock:
+            position = self.config.replay_positions.get(key, 0)
+            self.config.replay_positions[key] = position + 1
+        entry = entries[min(position, len(entries) - 1)]
+        response = entry["response"]
+        content_type = response.get("content_type", "application/json")
+
+        if "chunks" in response:
+            self._start_event_stream(response["status"], content_type)
+            started = time.perf_counter()
+            for chunk in response["chunks"]:
+                if self.config.replay_latency:
+                    wait = chunk["offset_ms"] / 1000 - (time.perf_counter() - started)
+                    if wait > 0:
+                        time.sleep(wait)
+                self.wfile.write(chunk["data"].encode("utf-8"))
+                self.wfile.flush()
+            return
+
+        if self.config.replay_latency:
+            time.sleep(entry.get("elapsed_ms", 0) / 1000)
+        self._send(response["status"], response["body"].encode("utf-8"), content_type=content_type)
+
+    def _proxy_and_record(self, raw: bytes, body: dict):
+        config = self.config
+        api_key = config.api_key or self.headers.get("Authorization", "").removeprefix("Bearer ")
+        request = urllib.request.Request(
+            config.upstream_url,
+            data=raw,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            method="POST",
+        )
+
+        started = time.perf_counter()
+        chunks = None
+        try:
+            with urllib.request.urlopen(request, timeout=60) as upstream:
+                status = upstream.status
+                content_type = upstream.headers.get("Content-Type", "application/json")
+                if content_type.startswith("text/event-stream"):
+                    # Forward and record each SSE line as it arrives, keeping its timing
+                    chunks = []
+                    self._start_event_stream(status, content_type)
+                    for line in upstream:
+                        offset_ms = (time.perf_counter() - started) * 1000
+                        chunks.append({"offset_ms": round(offset_ms, 1), "data": line.decode("utf-8")})
+                        self.wfile.write(line)
+                        self.wfile.flush()
+                    payload = b""
+                else:
+                    payload = upstream.read()
+        except urllib.error.HTTPError as e:
+            status = e.code
+            content_type = e.headers.get("Content-Type", "application/json")
+            payload = e.read()
+        except urllib.error.URLError as e:
+            self._send_error_json(502, f"Upstream unreachable: {e.reason}")
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        response = {"status": status, "content_type": content_type}
+        if chunks is not None:
+            response["chunks"] = chunks
+        else:
+            response["body"] = payload.decode("utf-8")
+        entry = {
+            "key": request_key(body),
+            "request": body,
+            "response": response,
+            "elapsed_ms": round(elapsed_ms, 1),
+        }
+        with config.lock:
+            with open(config.record_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+        if chunks is None:
+            self._send(status, payload, content_type=content_type)
+
+
+def make_server(config: StubConfig, host: str = "127.0.0.1", port: int = 0,
+                quiet: bool = True) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.config = config
+    server.quiet = quiet
+    return server
+
+
+def start_server(config: StubConfig, host: str = "127.0.0.1", port: int = 0,
+                 quiet: bool = True) -> ThreadingHTTPServer:
+    """Start the stand-in server on a background thread; port 0 picks a free port"""
+    server = make_server(config, host, port, quiet)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def server_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{CHAT_PATH}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Groq chat completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Delay before the first token (default: 0)")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0,
+                        help="Completion token rate; 0 means instant (default: 0)")
+    parser.add_argument("--completion-tokens", type=int, default=40,
+                        help="Tokens per stub answer, capped by max_tokens (default: 40)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with an injected error (default: 0)")
+    parser.add_argument("--error-codes", default="429,500,503",
+                        help="Comma-separated status codes to inject (default: 429,500,503)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for error injection")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="FILE", help="Proxy to Groq and append pairs to FILE (JSONL)")
+    mode.add_argument("--replay", metavar="FILE", help="Answer from a recording made with --record")
+    parser.add_argument("--replay-latency", action="store_true",
+                        help="With --replay, wait as long as the recorded response took")
+    parser.add_argument("--upstream", default=GROQ_URL, help="Upstream URL for --record")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    api_key = None
+    if args.record:
+        api_key = os.getenv("GROQ_API_KEY")
+        if not api_key:
+            print("⚠️  GROQ_API_KEY not set; forwarding the client's Authorization header instead")
+        os.makedirs(os.path.dirname(args.record) or ".", exist_ok=True)
+
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        error_codes=[int(c) for c in args.error_codes.split(",") if c.strip()],
+        seed=args.seed,
+        record_path=args.record,
+        replay_path=args.replay,
+        replay_latency=args.replay_latency,
+        upstream_url=args.upstream,
+        api_key=api_key,
+    )
+
+    server = make_server(config, args.host, args.port, quiet=not args.verbose)
+
+    if args.record:
+        print(f"🔴 Recording to {args.record} (upstream: {args.upstream})")
+    elif args.replay:
+        total = sum(len(entries) for entries in config.recordings.values())
+        print(f"▶️  Replaying {total} recorded response(s) from {args.replay}")
+    else:
+        print("🧪 Serving stub responses")
+    print(f"✅ Listening on {server_url(server)}")
+    print(f"   Use: GROQ_API_URL={server_url(server)}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped.")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
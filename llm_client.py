@@ -7,8 +7,9 @@ Allows the LLM to query the agile board through MCP
 import asyncio
 import json
 import os
+import re
 import sys
-from typing import Optional
+from typing import Dict, List, Optional
 import subprocess
 
 # Check for required packages
@@ -29,15 +30,60 @@ except ImportError:
 load_dotenv()
 
 
+SUMMARY_HEADER = "Summary of the earlier conversation:\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token) used for budgeting"""
+    return (len(text) + 3) // 4
+
+
+def keep_head(text: str, max_chars: int) -> str:
+    """Keep the start of text, cut back to the last word boundary within max_chars"""
+    text = text.strip()
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars + 1]
+    boundary = max(cut.rfind(" "), cut.rfind("\n"))
+    return cut[:boundary].rstrip() if boundary > 0 else ""
+
+
+def keep_tail(text: str, max_chars: int) -> str:
+    """Keep the end of text, starting at the first word boundary within max_chars"""
+    text = text.strip()
+    if len(text) <= max_chars:
+        return text
+    if max_chars <= 0:
+        return ""
+    cut = text[-(max_chars + 1):]
+    boundary = re.search(r"\s", cut)
+    return cut[boundary.end():].lstrip() if boundary else ""
+
+
 class GroqMCPClient:
-    def __init__(self, groq_api_key: str, model: str = "llama-3.3-70b-versatile"):
+    def __init__(self, groq_api_key: str, model: str = "llama-3.3-70b-versatile",
+                 max_history_turns: int = 6, history_token_budget: int = 3000,
+                 summary_token_budget: int = 400):
         self.groq_api_key = groq_api_key
         self.model = model
-        self.groq_url = "https://api.groq.com/openai/v1/chat/completions"
+        # GROQ_API_URL lets the client talk to a local stand-in (see groq_stub_server.py)
+        self.groq_url = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
         self.mcp_session: Optional[ClientSession] = None
         self.agile_board_data = None
         self.ui_accessibility_snapshot = None
         self.ui_html_snapshot = None
+
+        # Conversation state: recent turns are sent verbatim, older turns are
+        # folded into a running summary so each request stays bounded.
+        # history_token_budget covers summary + history; the summary gets
+        # summary_token_budget of it.
+        self.max_history_turns = max_history_turns
+        self.history_token_budget = history_token_budget
+        self.summary_token_budget = summary_token_budget
+        self.history: List[Dict[str, str]] = []
+        self.summary = ""
+        self._summary_task: Optional[asyncio.Task] = None
+        self._system_prompt: Optional[str] = None
         
     async def connect_to_mcp(self):
         """Connect to the MCP server and fetch agile board data + UI snapshots"""
@@ -53,6 +99,7 @@ class GroqMCPClient:
             async with ClientSession(read, write) as session:
                 await session.initialize()
                 self.mcp_session = session
+                self._system_prompt = None  # Rebuilt from the freshly loaded data
 
                 # List available resources
                 resources = await session.list_resources()
@@ -83,11 +130,14 @@ class GroqMCPClient:
 
                 return self.agile_board_data
     
-    async def query_groq(self, user_question: str) -> str:
-        """Send question to Groq with agile board context + UI snapshots"""
+    def build_system_prompt(self) -> str:
+        """Build the system prompt once and reuse it verbatim on every turn.
 
-        if not self.agile_board_data:
-            return "❌ Error: No agile board data loaded. Please connect to MCP first."
+        Keeping this prefix byte-identical across turns lets the provider's
+        prompt cache reuse it; per-conversation state goes after it.
+        """
+        if self._system_prompt is not None:
+            return self._system_prompt
 
         # Build context for the LLM
         context_parts = [
@@ -139,35 +189,163 @@ class GroqMCPClient:
             "database vs what's shown in the UI, point them out!"
         ])
 
-        system_prompt = "\n".join(context_parts)
+        self._system_prompt = "\n".join(context_parts)
+        return self._system_prompt
+
+    def reset_conversation(self):
+        """Forget previous turns and the running summary"""
+        if self._summary_task and not self._summary_task.done():
+            self._summary_task.cancel()
+        self._summary_task = None
+        self.history = []
+        self.summary = ""
+
+    def _history_tokens(self) -> int:
+        return sum(estimate_tokens(m["content"]) for m in self.history)
+
+    def build_messages(self, user_question: str) -> List[Dict[str, str]]:
+        """Assemble the request: stable system prompt, summary, recent turns, question"""
+        messages = [{"role": "system", "content": self.build_system_prompt()}]
+        if self.summary:
+            messages.append({"role": "system", "content": SUMMARY_HEADER + self.summary})
+        messages.extend(self.history)
+        messages.append({"role": "user", "content": user_question})
+        return messages
+
+    async def _post_chat(self, client: httpx.AsyncClient, messages: List[Dict[str, str]],
+                         max_tokens: int, temperature: float = 0.7) -> dict:
+        response = await client.post(
+            self.groq_url,
+            headers={
+                "Authorization": f"Bearer {self.groq_api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            }
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _summary_char_limit(self) -> int:
+        """Characters available to the summary once its header is accounted for"""
+        return max(0, (self.summary_token_budget - estimate_tokens(SUMMARY_HEADER)) * 4)
+
+    def _fallback_summary(self, transcript: str) -> str:
+        """Combine the existing summary with the newest part of the transcript.
 
+        The existing summary keeps at least half of the space (its beginning,
+        i.e. the oldest facts); the transcript tail fills the rest.
+        """
+        limit = self._summary_char_limit()
+        summary = keep_head(self.summary, limit // 2 if transcript else limit)
+        remaining = limit - len(summary) - 1 if summary else limit
+        tail = keep_tail(transcript, remaining)
+        return "\n".join(part for part in (summary, tail) if part)
+
+    async def _summarize_turns(self, turns: List[Dict[str, str]]):
+        """Fold evicted turns into the running summary"""
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in turns)
+        # Size the request so a well-behaved answer already fits the summary budget
+        max_summary_tokens = max(1, self._summary_char_limit() // 4)
+        max_words = max(10, min(150, max_summary_tokens // 2))
         messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_question}
+            {"role": "system", "content": (
+                "Update the running summary of a conversation about an agile board. "
+                "Keep facts, names, statuses and open questions. Reply with the summary only, "
+                f"in at most {max_words} words."
+            )},
+            {"role": "user", "content": (
+                f"Current summary:\n{self.summary or '(none)'}\n\n"
+                f"New turns:\n{transcript}"
+            )},
         ]
-        
+        try:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                result = await self._post_chat(client, messages, max_tokens=max_summary_tokens,
+                                               temperature=0.2)
+            content = result["choices"][0]["message"]["content"]
+            self.summary = keep_head(content, self._summary_char_limit())
+        except (httpx.HTTPError, KeyError, IndexError) as e:
+            # Fall back to a truncated transcript so the context is not lost entirely
+            print(f"⚠️  Could not summarize older turns: {e}")
+            self.summary = self._fallback_summary(transcript)
+
+    def _evict_old_turns(self) -> List[Dict[str, str]]:
+        """Drop old turns in one block once the window or token budget is exceeded.
+
+        History is cut back to half the window, so summarization happens only
+        every few turns and the request prefix stays unchanged in between.
+        """
+        history_budget = self.history_token_budget - self.summary_token_budget
+        if (len(self.history) <= 2 * self.max_history_turns
+                and self._history_tokens() <= history_budget):
+            return []
+
+        keep = 2 * (self.max_history_turns // 2)
+        evicted = self.history[:-keep] if keep else self.history[:]
+        self.history = self.history[len(evicted):]
+        while self.history and self._history_tokens() > history_budget:
+            # Drop the oldest user/assistant pair
+            evicted.extend(self.history[:2])
+            self.history = self.history[2:]
+        return evicted
+
+    async def wait_for_summary(self):
+        """Wait for a pending background summarization, if any"""
+        if self._summary_task:
+            task, self._summary_task = self._summary_task, None
+            await task
+
+    async def query_groq(self, user_question: str) -> str:
+        """Send question to Groq with agile board context + UI snapshots + conversation"""
+
+        if not self.agile_board_data:
+            return "❌ Error: No agile board data loaded. Please connect to MCP first."
+
+        # Usually already finished while the previous answer was being read
+        await self.wait_for_summary()
+        messages = self.build_messages(user_question)
+
         print(f"\n🤖 Asking Groq ({self.model})...")
-        
+
         async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                self.groq_url,
-                headers={
-                    "Authorization": f"Bearer {self.groq_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": self.model,
-                    "messages": messages,
-                    "temperature": 0.7,
-                    "max_tokens": 1024
-                }
-            )
-            
-            if response.status_code != 200:
-                return f"❌ Groq API Error: {response.status_code} - {response.text}"
-            
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
+            try:
+                result = await self._post_chat(client, messages, max_tokens=1024)
+            except httpx.HTTPStatusError as e:
+                return f"❌ Groq API Error: {e.response.status_code} - {e.response.text}"
+
+        answer = result["choices"][0]["message"]["content"]
+        self.history.append({"role": "user", "content": user_question})
+        self.history.append({"role": "assistant", "content": answer})
+
+        # Summarize evicted turns in the background, off this turn's critical path
+        evicted = self._evict_old_turns()
+        if evicted:
+            self._summary_task = asyncio.create_task(self._summarize_turns(evicted))
+
+        self._report_context_cost(messages, result.get("usage") or {})
+        return answer
+
+    def _report_context_cost(self, messages: List[Dict[str, str]], usage: dict):
+        """Print how much context this turn cost"""
+        system_tokens = estimate_tokens(messages[0]["content"])
+        summary_tokens = sum(estimate_tokens(m["content"]) for m in messages[1:-1] if m["role"] == "system")
+        previous = [m for m in messages[1:-1] if m["role"] != "system"]
+        history_tokens = sum(estimate_tokens(m["content"]) for m in previous)
+        print(f"📏 Context: ~{system_tokens} system + ~{summary_tokens} summary + "
+              f"~{history_tokens} history tokens ({len(previous) // 2} previous turn(s))")
+
+        if usage:
+            details = usage.get("prompt_tokens_details") or {}
+            cached = details.get("cached_tokens")
+            line = f"📊 Usage: {usage.get('prompt_tokens')} prompt + {usage.get('completion_tokens')} completion tokens"
+            if cached is not None:
+                line += f" ({cached} prompt tokens cached)"
+            print(line)
     
     async def interactive_mode(self):
         """Run interactive Q&A session"""
@@ -175,6 +353,7 @@ class GroqMCPClient:
         print("🎯 Agile Board QA Assistant (powered by Groq + MCP)")
         print("="*60)
         print("\nType your questions about the agile board.")
+        print("Follow-up questions keep the conversation context; type 'reset' to start over.")
         print("Type 'quit' or 'exit' to end the session.\n")
         
         while True:
@@ -184,12 +363,18 @@ class GroqMCPClient:
                 if question.lower() in ['quit', 'exit', 'q']:
                     print("\n👋 Goodbye!")
                     break
+
+                if question.lower() == 'reset':
+                    self.reset_conversation()
+                    print("\n🧹 Conversation cleared.")
+                    continue
                 
                 if not question:
                     continue
                 
                 answer = await self.query_groq(question)
                 print(f"\n🤖 Assistant:\n{answer}")
+                await self.wait_for_summary()
                 
             except KeyboardInterrupt:
                 print("\n\n👋 Goodbye!")
@@ -202,7 +387,11 @@ async def main():
     # Get Groq API key from .env file
     groq_api_key = os.getenv("GROQ_API_KEY")
 
-    if not groq_api_key:
+    if not groq_api_key and os.getenv("GROQ_API_URL"):
+        # A custom endpoint such as groq_stub_server.py doesn't need a real key
+        groq_api_key = "offline"
+        print(f"✅ No API key needed for GROQ_API_URL={os.getenv('GROQ_API_URL')}")
+    elif not groq_api_key:
         print("❌ GROQ_API_KEY not found in .env file")
         print("\nPlease create a .env file with your API key:")
         print("  1. Copy .env.example to .env")
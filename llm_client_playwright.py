@@ -24,7 +24,8 @@ class GroqPlaywrightClient:
     def __init__(self, groq_api_key: str, model: str = "llama-3.3-70b-versatile"):
         self.groq_api_key = groq_api_key
         self.model = model
-        self.groq_url = "https://api.groq.com/openai/v1/chat/completions"
+        # GROQ_API_URL lets the client talk to a local stand-in (see groq_stub_server.py)
+        self.groq_url = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
         
         # Database MCP session
         self.db_session: Optional[ClientSession] = None
@@ -144,7 +145,10 @@ class GroqPlaywrightClient:
 async def main():
     # Get API key
     groq_api_key = os.getenv("GROQ_API_KEY")
-    if not groq_api_key:
+    if not groq_api_key and os.getenv("GROQ_API_URL"):
+        # A custom endpoint such as groq_stub_server.py doesn't need a real key
+        groq_api_key = "offline"
+    elif not groq_api_key:
         print("❌ Error: GROQ_API_KEY not found in .env file")
         sys.exit(1)
     
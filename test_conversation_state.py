@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test script to verify GroqMCPClient conversation state (window, budget, summary)
+Runs offline against groq_stub_server.py - no Groq API key or MCP server needed
+"""
+
+import asyncio
+import contextlib
+import io
+
+from groq_stub_server import StubConfig, server_url, start_server
+from llm_client import SUMMARY_HEADER, GroqMCPClient, estimate_tokens
+
+SAMPLE_DATA = [
+    {"id": 1, "engineer": "Alice Smith", "work_item": "Implement login form", "status": "Developing"},
+    {"id": 9, "engineer": "Alice Smith", "work_item": "Incorrect error message on reset", "status": "Ready for QA"},
+]
+
+
+def make_client(url: str, **kwargs) -> GroqMCPClient:
+    client = GroqMCPClient("offline-test-key", **kwargs)
+    client.groq_url = url
+    client.agile_board_data = SAMPLE_DATA
+    return client
+
+
+def capture_requests(client: GroqMCPClient) -> list:
+    """Record the messages of every answer request (not summarization calls)"""
+    sent = []
+    post_chat = client._post_chat
+
+    async def recording_post_chat(http_client, messages, max_tokens, temperature=0.7):
+        if max_tokens == 1024:
+            sent.append(messages)
+        return await post_chat(http_client, messages, max_tokens, temperature)
+
+    client._post_chat = recording_post_chat
+    return sent
+
+
+async def ask(client: GroqMCPClient, question: str) -> str:
+    with contextlib.redirect_stdout(io.StringIO()):
+        answer = await client.query_groq(question)
+    assert not answer.startswith("❌"), answer
+    return answer
+
+
+async def check_window_compaction(url: str):
+    client = make_client(url, max_history_turns=4, history_token_budget=100000)
+    for i in range(5):
+        await ask(client, f"Question {i}")
+        await client.wait_for_summary()
+        if i < 4:
+            assert len(client.history) == 2 * (i + 1), f"turn {i}: {len(client.history)} messages"
+    # Window exceeded on turn 5 -> cut back to half the window in one block
+    assert len(client.history) == 4, f"expected 4 messages after compaction, got {len(client.history)}"
+    assert client.history[0]["content"] == "Question 3"
+    assert client.summary, "evicted turns should be summarized"
+
+
+async def check_token_budget_and_prefix(url: str):
+    client = make_client(url, max_history_turns=10, history_token_budget=250, summary_token_budget=80)
+    sent = capture_requests(client)
+    history_budget = client.history_token_budget - client.summary_token_budget
+
+    for i in range(8):
+        await ask(client, f"Tell me about assignment number {i} in detail")
+        await client.wait_for_summary()
+        assert client._history_tokens() <= history_budget, \
+            f"turn {i}: history uses {client._history_tokens()} tokens, budget {history_budget}"
+        summary_tokens = estimate_tokens(SUMMARY_HEADER + client.summary) if client.summary else 0
+        assert summary_tokens <= client.summary_token_budget, \
+            f"turn {i}: summary uses {summary_tokens} tokens, budget {client.summary_token_budget}"
+
+    assert len(client.history) < 2 * 8, "token budget should have forced compaction"
+    first_prefixes = {messages[0]["content"].encode("utf-8") for messages in sent}
+    assert len(sent) == 8 and len(first_prefixes) == 1, "system prompt changed between turns"
+    for messages in sent:
+        conversation = sum(estimate_tokens(m["content"]) for m in messages[1:-1])
+        assert conversation <= client.history_token_budget, f"sent {conversation} conversation tokens"
+
+
+async def check_summary_fallback():
+    # Short answers, so the whole evicted transcript fits the summary cap
+    short = start_server(StubConfig(completion_tokens=5))
+    failing = start_server(StubConfig(error_rate=1.0, error_codes=[500, 503]))
+    try:
+        client = make_client(server_url(short), max_history_turns=2, history_token_budget=100000,
+                             summary_token_budget=60)
+        for i in range(3):
+            await ask(client, f"Fallback question {i}")
+            if i < 2:
+                await client.wait_for_summary()
+
+        # The third turn evicted a block; its summary request hits injected 5xx errors
+        assert client._summary_task is not None, "compaction should have scheduled a summary"
+        client.groq_url = server_url(failing)
+        with contextlib.redirect_stdout(io.StringIO()):
+            await client.wait_for_summary()
+
+        assert failing.config.request_count == 1, "summary call should have reached the failing server"
+        assert "user: Fallback question 0" in client.summary, "fallback should keep the evicted transcript"
+        summary_tokens = estimate_tokens(SUMMARY_HEADER + client.summary)
+        assert summary_tokens <= client.summary_token_budget, f"fallback summary uses {summary_tokens} tokens"
+    finally:
+        for server in (failing, short):
+            server.shutdown()
+            server.server_close()
+
+
+async def check_reset_cancels_summary():
+    slow = start_server(StubConfig(latency_ms=300))
+    try:
+        client = make_client(server_url(slow), max_history_turns=2, history_token_budget=100000)
+        for question in ("First question", "Second question"):
+            await ask(client, question)
+        await ask(client, "Third question")
+
+        task = client._summary_task
+        assert task is not None, "compaction should have scheduled a summary"
+        await asyncio.sleep(0.05)  # Let the summary request start
+        client.reset_conversation()
+        await asyncio.wait([task], timeout=1)  # Cancellation unwinds through the HTTP client
+
+        assert client._summary_task is None, "reset should drop the pending summary task"
+        assert task.cancelled(), "reset should cancel the pending summary task"
+        assert client.history == [] and client.summary == ""
+
+        await asyncio.sleep(0.4)
+        assert client.summary == "", "cancelled summary must not repopulate the summary"
+    finally:
+        slow.shutdown()
+        slow.server_close()
+
+
+async def test_conversation_state():
+    """Run all conversation state checks"""
+
+    print("🧪 Testing Conversation State...")
+    print("-" * 50)
+
+    server = start_server(StubConfig(completion_tokens=60))
+    url = server_url(server)
+    checks = [
+        ("History length after window compaction", lambda: check_window_compaction(url)),
+        ("Token budget, summary cap and stable system prefix", lambda: check_token_budget_and_prefix(url)),
+        ("Summary fallback on injected 5xx errors", check_summary_fallback),
+        ("Reset cancels a pending summary", check_reset_cancels_summary),
+    ]
+
+    passed = True
+    try:
+        for i, (name, check) in enumerate(checks, 1):
+            print(f"\n{i}️⃣  {name}...")
+            try:
+                await check()
+                print("   ✅ Passed")
+            except AssertionError as e:
+                print(f"   ❌ Failed: {e}")
+                passed = False
+            except Exception as e:
+                print(f"   ❌ Error: {e}")
+                print(f"   Type: {type(e).__name__}")
+                passed = False
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("\n" + "=" * 50)
+    print("✅ Conversation State Test PASSED!" if passed else "❌ Conversation State Test FAILED!")
+    print("=" * 50)
+    return passed
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_conversation_state())
+    exit(0 if success else 1)
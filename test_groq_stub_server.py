@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the local Groq stand-in (groq_stub_server.py) works
+Runs offline - checks error injection, the SSE stream format and record/replay
+"""
+
+import http.client
+import json
+import os
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from groq_stub_server import CHAT_PATH, StubConfig, server_url, start_server
+
+REQUEST = {
+    "model": "llama-3.3-70b-versatile",
+    "messages": [
+        {"role": "system", "content": "You are an AI assistant helping with agile board analysis and QA."},
+        {"role": "user", "content": "Which statuses are in the database?"},
+    ],
+    "temperature": 0.7,
+    "max_tokens": 12,
+}
+
+
+def post(url: str, body: dict):
+    """POST a JSON body and return (status, headers, text)"""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, response.headers, response.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read().decode("utf-8")
+
+
+def parse_sse(text: str):
+    """Split an SSE body into its data payloads, checking the framing"""
+    events = text.split("\n\n")
+    assert events[-1] == "", "stream must end with a blank line"
+    payloads = []
+    for event in events[:-1]:
+        assert event.startswith("data: "), f"bad event: {event!r}"
+        payloads.append(event[len("data: "):])
+    assert payloads[-1] == "[DONE]", "stream must end with data: [DONE]"
+    return payloads
+
+
+def check_error_injection():
+    server = start_server(StubConfig(error_rate=1.0, error_codes=[429]))
+    try:
+        status, headers, text = post(server_url(server), REQUEST)
+        assert status == 429, f"expected 429, got {status}"
+        assert headers.get("Retry-After") == "1", "429 should carry Retry-After"
+        assert json.loads(text)["error"]["code"] == 429
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    server = start_server(StubConfig(error_rate=1.0, error_codes=[503]))
+    try:
+        status, _, _ = post(server_url(server), REQUEST)
+        assert status == 503, f"expected 503, got {status}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    server = start_server(StubConfig(error_rate=0.0))
+    try:
+        status, _, text = post(server_url(server), REQUEST)
+        assert status == 200, f"expected 200, got {status}"
+        assert json.loads(text)["choices"][0]["message"]["content"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def check_unknown_path_keeps_connection():
+    server = start_server(StubConfig())
+    try:
+        host, port = server.server_address[:2]
+        connection = http.client.HTTPConnection(host, port, timeout=10)
+        body = json.dumps(REQUEST)
+        headers = {"Content-Type": "application/json"}
+
+        connection.request("POST", "/wrong/path", body, headers)
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 404, f"expected 404, got {response.status}"
+
+        # Same kept-alive connection: the 404's body must not leak into this request
+        connection.request("POST", CHAT_PATH, body, headers)
+        response = connection.getresponse()
+        text = response.read().decode("utf-8")
+        assert response.status == 200, f"expected 200 after a 404, got {response.status}: {text[:60]}"
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def check_sse_format():
+    server = start_server(StubConfig())
+    try:
+        _, _, text = post(server_url(server), REQUEST)
+        expected = json.loads(text)["choices"][0]["message"]["content"]
+
+        status, headers, text = post(server_url(server), {**REQUEST, "stream": True})
+        assert status == 200, f"expected 200, got {status}"
+        assert headers.get("Content-Type") == "text/event-stream"
+
+        chunks = [json.loads(p) for p in parse_sse(text)[:-1]]
+        content = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks)
+        assert content == expected, f"streamed {content!r}, expected {expected!r}"
+        assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+        assert all(c["object"] == "chat.completion.chunk" for c in chunks)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def check_record_replay():
+    fd, record_path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    upstream = start_server(StubConfig(latency_ms=200))
+    recorder = start_server(StubConfig(record_path=record_path, upstream_url=server_url(upstream)))
+    try:
+        _, _, recorded = post(server_url(recorder), REQUEST)
+        _, _, recorded_stream = post(server_url(recorder), {**REQUEST, "stream": True})
+    finally:
+        for server in (recorder, upstream):
+            server.shutdown()
+            server.server_close()
+
+    try:
+        for replay_latency in (False, True):
+            replayer = start_server(StubConfig(replay_path=record_path, replay_latency=replay_latency))
+            try:
+                started = time.perf_counter()
+                status, _, replayed = post(server_url(replayer), REQUEST)
+                elapsed = time.perf_counter() - started
+                assert status == 200 and replayed == recorded, "replayed body differs from recording"
+                if replay_latency:
+                    assert elapsed >= 0.15, f"replay ignored recorded latency ({elapsed:.3f}s)"
+                else:
+                    assert elapsed < 0.15, f"replay without latency was slow ({elapsed:.3f}s)"
+
+                status, _, replayed_stream = post(server_url(replayer), {**REQUEST, "stream": True})
+                assert status == 200 and replayed_stream == recorded_stream, "replayed stream differs"
+                parse_sse(replayed_stream)
+
+                status, _, _ = post(server_url(replayer), {**REQUEST, "max_tokens": 1})
+                assert status == 404, f"unrecorded request should be 404, got {status}"
+            finally:
+                replayer.shutdown()
+                replayer.server_close()
+    finally:
+        os.remove(record_path)
+
+
+def check_replay_repeated_request():
+    fd, record_path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    # Same request recorded several times: errors and successes with distinct ids
+    upstream = start_server(StubConfig(error_rate=0.5, error_codes=[429], seed=1))
+    recorder = start_server(StubConfig(record_path=record_path, upstream_url=server_url(upstream)))
+    try:
+        recorded = [post(server_url(recorder), REQUEST) for _ in range(4)]
+    finally:
+        for server in (recorder, upstream):
+            server.shutdown()
+            server.server_close()
+
+    try:
+        recorded = [(status, text) for status, _, text in recorded]
+        assert len(set(recorded)) > 1, "recorded responses should differ"
+
+        replayer = start_server(StubConfig(replay_path=record_path))
+        try:
+            replayed = [post(server_url(replayer), REQUEST) for _ in range(5)]
+        finally:
+            replayer.shutdown()
+            replayer.server_close()
+
+        replayed = [(status, text) for status, _, text in replayed]
+        assert replayed[:4] == recorded, "repeated request not replayed in recorded order"
+        assert replayed[4] == recorded[-1], "after the recording runs out, the last response is repeated"
+    finally:
+        os.remove(record_path)
+
+
+def test_groq_stub_server():
+    """Run all stand-in checks"""
+
+    print("🧪 Testing Groq Stand-in Server...")
+    print("-" * 50)
+
+    checks = [
+        ("Error injection (429 / 503 / none)", check_error_injection),
+        ("Unknown path on a kept-alive connection", check_unknown_path_keeps_connection),
+        ("SSE stream format", check_sse_format),
+        ("Record -> replay round trip", check_record_replay),
+        ("Replay of a repeated request", check_replay_repeated_request),
+    ]
+
+    passed = True
+    for i, (name, check) in enumerate(checks, 1):
+        print(f"\n{i}️⃣  {name}...")
+        try:
+            check()
+            print("   ✅ Passed")
+        except AssertionError as e:
+            print(f"   ❌ Failed: {e}")
+            passed = False
+        except Exception as e:
+            print(f"   ❌ Error: {e}")
+            print(f"   Type: {type(e).__name__}")
+            passed = False
+
+    print("\n" + "=" * 50)
+    print("✅ Groq Stand-in Test PASSED!" if passed else "❌ Groq Stand-in Test FAILED!")
+    print("=" * 50)
+    return passed
+
+
+if __name__ == "__main__":
+    success = test_groq_stub_server()
+    exit(0 if success else 1)